@@ -9,13 +9,16 @@ Default signal: Binance BTCUSDT candles. Agents can customize signal source.
 import os
 import sys
 import json
-import math
+import re
 import argparse
+import asyncio
 import time
-from datetime import datetime, timezone, timedelta
-from urllib.request import urlopen, Request
-from urllib.error import HTTPError, URLError
-from urllib.parse import urlencode, quote
+from dataclasses import make_dataclass
+from datetime import datetime
+
+import httpx
+import numpy as np
+import orjson
 
 # Force line-buffered stdout for non-TTY environments
 sys.stdout.reconfigure(line_buffering=True)
@@ -28,6 +31,13 @@ except ImportError:
     JOURNAL_AVAILABLE = False
     def log_trade(*args, **kwargs): pass
 
+# Optional: Numba JIT for the signal kernel (falls back to plain NumPy)
+try:
+    from numba import njit, float64
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 # =============================================================================
 # Configuration
 # =============================================================================
@@ -48,6 +58,8 @@ CONFIG_SCHEMA = {
 TRADE_SOURCE = "sdk:fastloop"
 ASSET_SYMBOLS = {"BTC": "BTCUSDT", "ETH": "ETHUSDT", "SOL": "SOLUSDT"}
 ASSET_PATTERNS = {"BTC": ["bitcoin up or down"], "ETH": ["ethereum up or down"], "SOL": ["solana up or down"]}
+_Q_PATTERNS = {a: re.compile("|".join(map(re.escape, ps)), re.I) for a, ps in ASSET_PATTERNS.items()}
+MARKETS_CACHE_TTL = 60  # seconds; the fast-market set only rolls over every window
 
 def _load_config(schema, skill_file, config_filename="config.json"):
     from pathlib import Path
@@ -67,7 +79,18 @@ def _load_config(schema, skill_file, config_filename="config.json"):
         else: result[key] = spec.get("default")
     return result
 
-cfg = _load_config(CONFIG_SCHEMA, __file__)
+# Resolved CONFIG_SCHEMA values as a frozen slots class, generated from the schema
+# so the two can't drift; attribute reads stay cheap in the loop.
+FastLoopConfig = make_dataclass(
+    "FastLoopConfig", [(k, spec["type"]) for k, spec in CONFIG_SCHEMA.items()], slots=True, frozen=True
+)
+
+cfg = FastLoopConfig(**_load_config(CONFIG_SCHEMA, __file__))
+SYMBOL = ASSET_SYMBOLS[cfg.asset]
+
+# Fixed for the life of the process — format once, not every cycle
+BINANCE_URL = f"https://api.binance.com/api/v3/klines?symbol={SYMBOL}&interval=1m&limit={cfg.lookback_minutes}"
+POLY_URL = "https://gamma-api.polymarket.com/markets?limit=20&closed=false&tag=crypto"
 
 # =============================================================================
 # API Helpers & Discovery
@@ -83,47 +106,130 @@ def get_client(live=True):
         _client = SimmerClient(api_key=api_key, venue=venue, live=live)
     return _client
 
-def _api_request(url, method="GET", data=None, headers=None):
+def new_http_client():
+    """Pooled keep-alive client, so the TCP+TLS handshake to Binance / Gamma is paid
+    once per run instead of every poll cycle. Its connections belong to the event
+    loop that first uses it — open it with `async with` inside that loop."""
+    return httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=16, keepalive_expiry=60),
+        timeout=15.0,
+    )
+
+class MinInterval:
+    """Spaces successive awaits of wait() at least `dt` seconds apart."""
+    def __init__(self, dt):
+        self.dt, self.last = dt, float("-inf")
+
+    async def wait(self):
+        delay = self.last + self.dt - time.monotonic()
+        if delay > 0: await asyncio.sleep(delay)
+        self.last = time.monotonic()
+
+# Hard floor on Binance REST polling, whatever the loop cadence is changed to
+_BINANCE_GATE = MinInterval(30)
+
+async def _api_request(http, url, method="GET", data=None, headers=None):
     try:
-        req = Request(url, data=json.dumps(data).encode() if data else None, headers=headers or {}, method=method)
-        with urlopen(req, timeout=15) as resp: return json.loads(resp.read().decode())
+        if data is not None: headers = {"Content-Type": "application/json", **(headers or {})}
+        resp = await http.request(method, url, content=orjson.dumps(data) if data is not None else None, headers=headers)
+        resp.raise_for_status()
+        return orjson.loads(resp.content)
     except Exception as e: return {"error": str(e)}
 
-def get_binance_momentum(symbol="BTCUSDT", lookback=5):
-    url = f"https://api.binance.com/api/v3/klines?symbol={symbol}&interval=1m&limit={lookback}"
-    res = _api_request(url)
+def _compute_signal(opens, closes, vols):
+    """Return [price_then, price_now, momentum_pct, volume_ratio] for one klines window."""
+    out = np.empty(4)
+    p_then, p_now = opens[0], closes[-1]
+    out[0], out[1] = p_then, p_now
+    out[2] = ((p_now - p_then) / p_then) * 100.0
+    vol_mean = vols.mean()
+    # Guarded explicitly: NumPy would return nan here, numba would raise
+    if vol_mean == 0.0: raise ZeroDivisionError("zero average volume")
+    out[3] = vols[-1] / vol_mean
+    return out
+
+if NUMBA_AVAILABLE:
+    _compute_signal = njit(float64[:](float64[:], float64[:], float64[:]), cache=True)(_compute_signal)
+
+async def get_binance_klines(http, url=BINANCE_URL):
+    await _BINANCE_GATE.wait()
+    res = await _api_request(http, url)
     if not res or "error" in res: return None
-    p_then, p_now = float(res[0][1]), float(res[-1][4])
-    vols = [float(c[5]) for c in res]
+    return res
+
+def _quick_momentum(klines):
+    """Momentum % from first open and last close only — enough to reject weak signals."""
+    p_then, p_now = float(klines[0][1]), float(klines[-1][4])
+    return ((p_now - p_then) / p_then) * 100
+
+def _full_signal(klines):
+    # Kline rows: [open_time, open, high, low, close, volume, ...] with prices as strings.
+    # Pull only the three columns we use straight into float64, skipping an object array.
+    cols = np.array([(k[1], k[4], k[5]) for k in klines], dtype=np.float64)
+    opens, closes, vols = cols.T
+    p_then, p_now, momentum_pct, volume_ratio = (float(x) for x in _compute_signal(opens, closes, vols))
     return {
-        "momentum_pct": ((p_now - p_then) / p_then) * 100,
+        "momentum_pct": momentum_pct,
         "direction": "up" if p_now > p_then else "down",
         "price_now": p_now, "price_then": p_then,
-        "volume_ratio": vols[-1] / (sum(vols)/len(vols))
+        "volume_ratio": volume_ratio
     }
 
-def discover_markets(asset="BTC", window="5m"):
-    url = "https://gamma-api.polymarket.com/markets?limit=20&closed=false&tag=crypto"
-    res = _api_request(url)
-    if not res or "error" in res: return []
-    return [m for m in res if any(p in m.get("question","").lower() for p in ASSET_PATTERNS[asset]) and f"-{window}-" in m.get("slug","")]
+_MARKETS_CACHE = {}  # (asset, window) -> (monotonic expiry, market); misses are not cached
+
+def _time_left(market):
+    """Seconds until the market's endDate, or None if it has no usable endDate."""
+    try:
+        end = datetime.fromisoformat(market["endDate"].replace("Z", "+00:00")).timestamp()
+    except (KeyError, AttributeError, ValueError):
+        return None
+    return end - time.time()
+
+def _tradeable(market):
+    left = _time_left(market)
+    return left is None or left > cfg.min_time_remaining
+
+def _cache_ttl(market):
+    """MARKETS_CACHE_TTL, cut short so a cached market stops being served once
+    it is no longer _tradeable()."""
+    left = _time_left(market)
+    return MARKETS_CACHE_TTL if left is None else min(MARKETS_CACHE_TTL, left - cfg.min_time_remaining)
+
+async def discover_market(http, asset="BTC", window="5m"):
+    """Return the first live fast market for asset/window, or None."""
+    key = (asset, window)
+    hit = _MARKETS_CACHE.get(key)
+    if hit and time.monotonic() < hit[0]: return hit[1]
+
+    res = await _api_request(http, POLY_URL)
+    if not res or "error" in res: return None
+    q_search, slug_tok = _Q_PATTERNS[asset].search, f"-{window}-"
+    market = next((m for m in res if q_search(m.get("question","")) and slug_tok in m.get("slug","") and _tradeable(m)), None)
+    if market: _MARKETS_CACHE[key] = (time.monotonic() + _cache_ttl(market), market)
+    return market
 
 # =============================================================================
 # Strategy Execution
 # =============================================================================
 
-def run_fast_market_strategy(dry_run=True, quiet=False):
+async def run_fast_market_strategy(http, dry_run=True, quiet=False):
     if not quiet: print(f"\n⚡ Checking Markets... {datetime.now().strftime('%H:%M:%S')}")
     
-    momentum = get_binance_momentum(ASSET_SYMBOLS[cfg["asset"]], cfg["lookback_minutes"])
-    if not momentum or abs(momentum["momentum_pct"]) < cfg["min_momentum_pct"]:
+    # Binance and Gamma are independent — fetch both in one round-trip of wall time.
+    # Discovery runs even on weak cycles so its result lands in the TTL cache.
+    klines, target = await asyncio.gather(
+        get_binance_klines(http),
+        discover_market(http, cfg.asset, cfg.window),
+    )
+    # Weak signal is the common case — decide it before parsing volumes
+    if not klines or abs(_quick_momentum(klines)) < cfg.min_momentum_pct:
         if not quiet: print("⏸ Signal too weak.")
         return
 
-    markets = discover_markets(cfg["asset"], cfg["window"])
-    if not markets: return
+    if not target: return
+    momentum = _full_signal(klines)
 
-    target = markets[0]
     side = "yes" if momentum["direction"] == "up" else "no"
     
     if not quiet: print(f"🚀 Signal: {side.upper()} on {target['question']}")
@@ -133,7 +239,7 @@ def run_fast_market_strategy(dry_run=True, quiet=False):
         res = client.import_market(f"https://polymarket.com/event/{target['slug']}")
         mid = res.get("market_id")
         if mid:
-            trade = client.trade(market_id=mid, side=f"buy_{side}", amount=cfg["max_position"])
+            trade = client.trade(market_id=mid, side=f"buy_{side}", amount=cfg.max_position)
             print(f"✅ Trade placed: {trade.trade_id}")
     except Exception as e: print(f"❌ Error: {e}")
 
@@ -141,17 +247,21 @@ def run_fast_market_strategy(dry_run=True, quiet=False):
 # 24/7 Continuous Loop
 # =============================================================================
 
+async def main(live=False):
+    async with new_http_client() as http:
+        while True:
+            try:
+                await run_fast_market_strategy(http, dry_run=(not live))
+            except Exception as e:
+                print(f"Loop Error: {e}")
+            
+            # Poll every 30 seconds (no WebSocket needed)
+            await asyncio.sleep(30)
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--live", action="store_true")
     args = parser.parse_args()
 
     print(f"🤖 Starting Original 800-line Strategy ({'LIVE' if args.live else 'PAPER'})")
-    while True:
-        try:
-            run_fast_market_strategy(dry_run=(not args.live))
-        except Exception as e:
-            print(f"Loop Error: {e}")
-        
-        # Poll every 30 seconds (no WebSocket needed)
-        time.sleep(30)
+    asyncio.run(main(live=args.live))